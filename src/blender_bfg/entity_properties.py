@@ -1,4 +1,5 @@
 import bpy
+import bmesh
 from bpy.props import (
     StringProperty,
     PointerProperty,
@@ -6,31 +7,45 @@ from bpy.props import (
     FloatProperty,
     IntProperty,
     BoolProperty,
+    CollectionProperty,
 )
-from bpy.types import Panel, PropertyGroup, Operator
+from bpy.types import Panel, PropertyGroup, Operator, OperatorFileListElement
+from mathutils import Matrix
+import functools
 import json
 import os
-from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict, Any
-
-
-@dataclass
-class Choice:
+import re
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple, TypedDict
+import numpy as np  # bundled with Blender
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+# The parser emits plain dicts, these only describe their shape
+class Choice(TypedDict):
     value: str
     description: str
 
 
-@dataclass
-class Attribute:
+class Attribute(TypedDict):
     name: str
     type: str
+    type_code: int
     description: str
     default: Optional[str]
-    choices: Optional[List[Choice]] = None
+    choices: Optional[List[Choice]]
 
 
-@dataclass
-class EntityClass:
+class EntityClass(TypedDict):
     class_type: str
     base: Optional[str]
     color: Optional[str]
@@ -41,124 +56,301 @@ class EntityClass:
     attributes: List[Attribute]
 
 
+# Master tokenizer regex, tried in order at the current position. Only the
+# significant kinds (everything but WS and COMMENT) are seen by the parser.
+# Character classes are spelled out as ASCII sets, the same as CHAR_CLASS.
+TOKEN_RE = re.compile(
+    rb"(?P<WS>[ \t\n\r\f\v]+)"
+    rb"|(?P<COMMENT>//[^\n]*)"
+    rb'|(?P<STRING>"[^"]*")'
+    rb"|(?P<IDENT>[A-Za-z_][A-Za-z_0-9.]*)"
+    rb"|(?P<NUMBER>-?[0-9]+(?:\.[0-9]+)?)"
+    rb"|(?P<PUNCT>[@=:\[\]\(\)])"
+    rb"|(?P<OTHER>.)"
+)
+
+# Token kinds, numbered like the groups of TOKEN_RE so match.lastindex is the kind
+(
+    TOKEN_WS,
+    TOKEN_COMMENT,
+    TOKEN_STRING,
+    TOKEN_IDENT,
+    TOKEN_NUMBER,
+    TOKEN_PUNCT,
+    TOKEN_OTHER,
+) = range(1, 8)
+
+_LBRACE, _RBRACE, _LPAREN, _RPAREN = b"{}()"
+_NEWLINE, _QUOTE, _SLASH, _MINUS, _DOT = b'\n"/-.'
+
+
+if numba is not None:
+    # Byte classes for the JIT tokenizer, matching the character sets of TOKEN_RE
+    _CHAR_SPACE, _CHAR_ALPHA, _CHAR_DIGIT, _CHAR_DOT, _CHAR_PUNCT = range(1, 6)
+    CHAR_CLASS = np.zeros(256, np.int8)
+    CHAR_CLASS[list(b" \t\n\r\f\v")] = _CHAR_SPACE
+    CHAR_CLASS[list(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_")] = (
+        _CHAR_ALPHA
+    )
+    CHAR_CLASS[list(b"0123456789")] = _CHAR_DIGIT
+    CHAR_CLASS[_DOT] = _CHAR_DOT
+    CHAR_CLASS[list(b"@=:[]()")] = _CHAR_PUNCT
+
+    @numba.njit(nogil=True, cache=True)
+    def _tokenize_jit(buf, char_class):
+        """Split buf into the significant tokens of TOKEN_RE (no whitespace or
+        comments), returned as parallel (kinds, starts, ends) arrays"""
+        length = buf.shape[0]
+        kinds = np.empty(length, np.int8)
+        starts = np.empty(length, np.int32)
+        ends = np.empty(length, np.int32)
+        count = 0
+        position = 0
+
+        while position < length:
+            start = position
+            char = buf[position]
+            char_type = char_class[char]
+            position += 1
+
+            if char_type == _CHAR_SPACE:
+                while position < length and char_class[buf[position]] == _CHAR_SPACE:
+                    position += 1
+                continue
+
+            if char == _SLASH and position < length and buf[position] == _SLASH:
+                while position < length and buf[position] != _NEWLINE:
+                    position += 1
+                continue
+
+            if char == _QUOTE:
+                while position < length and buf[position] != _QUOTE:
+                    position += 1
+                if position < length:
+                    position += 1
+                    kind = TOKEN_STRING
+                else:
+                    # Unterminated string, only the quote itself is a token
+                    position = start + 1
+                    kind = TOKEN_OTHER
+            elif char_type == _CHAR_ALPHA:
+                while (
+                    position < length
+                    and _CHAR_ALPHA <= char_class[buf[position]] <= _CHAR_DOT
+                ):
+                    position += 1
+                kind = TOKEN_IDENT
+            elif char_type == _CHAR_DIGIT or (
+                char == _MINUS
+                and position < length
+                and char_class[buf[position]] == _CHAR_DIGIT
+            ):
+                while position < length and char_class[buf[position]] == _CHAR_DIGIT:
+                    position += 1
+                if (
+                    position + 1 < length
+                    and buf[position] == _DOT
+                    and char_class[buf[position + 1]] == _CHAR_DIGIT
+                ):
+                    position += 2
+                    while (
+                        position < length and char_class[buf[position]] == _CHAR_DIGIT
+                    ):
+                        position += 1
+                kind = TOKEN_NUMBER
+            elif char_type == _CHAR_PUNCT:
+                kind = TOKEN_PUNCT
+            else:
+                kind = TOKEN_OTHER
+
+            kinds[count] = kind
+            starts[count] = start
+            ends[count] = position
+            count += 1
+
+        return kinds[:count], starts[:count], ends[:count]
+
+
+# Attribute type codes, see _classify_type()
+TYPE_STRING, TYPE_INTEGER, TYPE_FLOAT, TYPE_BOOLEAN = range(4)
+
+# Type codes of the attribute type strings seen so far
+_TYPE_CODES: Dict[str, int] = {}
+
+
+def _classify_type(attr_type: str) -> int:
+    """Map an FGD attribute type, e.g. "integer", to its TYPE_* code"""
+    code = _TYPE_CODES.get(attr_type)
+    if code is None:
+        lowered = attr_type.lower()
+        if "integer" in lowered:
+            code = TYPE_INTEGER
+        elif "float" in lowered or "decimal" in lowered:
+            code = TYPE_FLOAT
+        elif "boolean" in lowered:
+            code = TYPE_BOOLEAN
+        else:
+            code = TYPE_STRING
+        _TYPE_CODES[attr_type] = code
+    return code
+
+
+def _decode(data: bytes) -> str:
+    """Decode a slice of FGD source, which is read as raw bytes"""
+    return data.decode("utf-8", "replace")
+
+
 class FGDParser:
-    def __init__(self, content: str):
+    def __init__(self, content: bytes):
         self.content = content
         self.position = 0
         self.length = len(content)
         self.last_attribute = None  # Track last parsed attribute for choices
 
+        if numba is not None:
+            # Tokenize the whole buffer natively up front, see _next_jit_token
+            kinds, starts, ends = _tokenize_jit(
+                np.frombuffer(content, dtype=np.uint8), CHAR_CLASS
+            )
+            self.token_kinds = kinds.tolist()
+            self.token_starts = starts.tolist()
+            self.token_ends = ends.tolist()
+            self.token_index = 0
+            self._next_token = self._next_jit_token
+
     def parse(self) -> List[EntityClass]:
         entities = []
-        while self.position < self.length:
-            self.consume_whitespace()
-            if self.position >= self.length:
+        while True:
+            kind, value, end = self._next_token()
+            if kind is None:
                 break
 
-            # Skip comments
-            if self.content[self.position :].startswith("//"):
-                self.skip_line()
-                continue
-
-            if self.content[self.position] == "@":
+            self.position = end
+            if kind == TOKEN_PUNCT and value == b"@":
                 entity = self.parse_entity()
                 if entity:
                     entities.append(entity)
-            else:
-                self.position += 1
 
         return entities
 
-    def skip_line(self):
-        while self.position < self.length and self.content[self.position] != "\n":
-            self.position += 1
-        self.position += 1
+    def _next_token(self) -> Tuple[Optional[int], bytes, int]:
+        """Skip whitespace and comments and peek at the next token.
+
+        Returns (kind, value, end) with self.position left at the start of the
+        token; callers consume it by setting self.position = end.
+        """
+        position = self.position
+        while position < self.length:
+            match = TOKEN_RE.match(self.content, position)
+            kind = match.lastindex
+            if kind == TOKEN_WS or kind == TOKEN_COMMENT:
+                position = match.end()
+                continue
 
-    def consume_whitespace(self):
-        while self.position < self.length and self.content[self.position].isspace():
-            self.position += 1
+            self.position = position
+            return kind, match.group(), match.end()
+
+        self.position = self.length
+        return None, b"", self.length
+
+    def _next_jit_token(self) -> Tuple[Optional[int], bytes, int]:
+        """_next_token over the tokens produced by _tokenize_jit"""
+        # The parser either peeks at the current token again or consumes it,
+        # anything else means a raw scan moved the position
+        index = self.token_index
+        count = len(self.token_starts)
+        if index < count and self.position == self.token_ends[index]:
+            index += 1
+        elif index == count or self.position != self.token_starts[index]:
+            return self._resync_jit_token()
+
+        self.token_index = index
+        if index == count:
+            self.position = self.length
+            return None, b"", self.length
+
+        start = self.token_starts[index]
+        end = self.token_ends[index]
+        self.position = start
+        return self.token_kinds[index], self.content[start:end], end
+
+    def _resync_jit_token(self) -> Tuple[Optional[int], bytes, int]:
+        """Read the next token with TOKEN_RE after a raw scan.
+
+        Raw scans (parentheses, skipped lines) can stop inside a token or
+        comment, where the up-front split no longer matches what TOKEN_RE
+        reads from there. The JIT tokens are used again once a token read here
+        lines up with one of them.
+        """
+        kind, value, end = FGDParser._next_token(self)
+        index = bisect_left(self.token_starts, self.position)
+        if (
+            kind is not None
+            and index < len(self.token_starts)
+            and self.token_starts[index] == self.position
+            and self.token_ends[index] == end
+        ):
+            self.token_index = index
+        else:
+            self.token_index = len(self.token_starts)
+        return kind, value, end
 
-    def parse_entity(self) -> Optional[EntityClass]:
-        # Skip @
-        self.position += 1
+    def _accept(self, punct: bytes) -> bool:
+        """Consume the next token if it is the given punctuation character"""
+        kind, value, end = self._next_token()
+        if kind == TOKEN_PUNCT and value == punct:
+            self.position = end
+            return True
+        return False
 
+    def parse_entity(self) -> Optional[EntityClass]:
         # Parse class type (PointClass, BaseClass, etc)
         class_type = self.parse_identifier().lower()
 
         # Parse parameters
-        color = None
-        size = None
-        base = None
-        model = None
-
-        self.consume_whitespace()
-        while self.position < self.length and self.content[self.position] != "=":
-            if self.content[self.position :].startswith("color"):
-                self.position += 5  # Skip "color"
-                color = self.parse_parentheses()
-            elif self.content[self.position :].startswith("size"):
-                self.position += 4  # Skip "size"
-                size = self.parse_parentheses()
-            elif self.content[self.position :].startswith("base"):
-                self.position += 4  # Skip "base"
-                base = self.parse_parentheses()
-            elif self.content[self.position :].startswith("model"):
-                self.position += 5  # Skip "model"
-                model_str = self.parse_model_parameter()
-                try:
-                    # Handle JSON-like model parameter
-                    model = json.loads(model_str.replace("'", '"'))
-                except json.JSONDecodeError:
-                    model = {"path": model_str}
-                except Exception as e:
-                    print(f"Warning: Failed to parse model parameter: {e}")
-                    model = {"path": model_str}
+        header = dict.fromkeys(_HEADER_HANDLERS)
+
+        while True:
+            kind, value, end = self._next_token()
+            if kind is None:
+                return None
+            if kind == TOKEN_PUNCT and value == b"=":
+                break
+
+            self.position = end
+            if kind != TOKEN_IDENT:
+                continue
+
+            keyword = value.decode("ascii").lower()
+            handler = _HEADER_HANDLERS.get(keyword)
+            if handler:
+                header[keyword] = handler(self)
             else:
-                # Skip until we find a space or equals sign
-                while (
-                    self.position < self.length
-                    and not self.content[self.position].isspace()
-                    and self.content[self.position] != "="
-                ):
-                    self.position += 1
-                self.consume_whitespace()
+                # Skip the arguments of unknown keywords, e.g. iconsprite(...)
+                self.parse_parentheses()
 
         # Skip =
-        self.position += 1
-        self.consume_whitespace()
+        self.position = end
 
         # Parse classname
         classname = self.parse_identifier()
 
         # Parse description
-        self.consume_whitespace()
-        if self.content[self.position] == ":":
-            self.position += 1
-            self.consume_whitespace()
+        if self._accept(b":"):
             description = self.parse_string()
         else:
             description = ""
 
         # Parse attributes
         attributes = []
-        self.consume_whitespace()
-        if self.position < self.length and self.content[self.position] == "[":
-            self.position += 1  # Skip [
-            while self.position < self.length:
-                self.consume_whitespace()
+        if self._accept(b"["):
+            while True:
+                kind, value, end = self._next_token()
 
                 # Check for end of attributes
-                if self.position >= self.length or self.content[self.position] == "]":
+                if kind is None or (kind == TOKEN_PUNCT and value == b"]"):
                     break
 
-                # Skip empty lines and comments
-                if self.content[self.position] == "\n":
-                    self.position += 1
-                    continue
-                if self.content[self.position :].startswith("//"):
-                    self.skip_line()
-                    continue
-
                 attribute = self.parse_attribute()
                 if attribute:
                     attributes.append(attribute)
@@ -166,187 +358,139 @@ class FGDParser:
                     # If attribute parsing fails, skip to next line to avoid infinite loop
                     self.skip_to_next_line()
 
-            if self.position < self.length and self.content[self.position] == "]":
-                self.position += 1  # Skip ]
-
-        return EntityClass(
-            class_type=class_type,
-            base=base,
-            color=color,
-            size=size,
-            model=model,
-            classname=classname,
-            description=description,
-            attributes=attributes,
-        )
+            self._accept(b"]")
+
+        return {
+            "class_type": class_type,
+            "base": header["base"],
+            "color": header["color"],
+            "size": header["size"],
+            "model": header["model"],
+            "classname": classname,
+            "description": description,
+            "attributes": attributes,
+        }
 
     def parse_attribute(self) -> Optional[Attribute]:
+        kind, value, end = self._next_token()
+        if kind is None:
+            return None
+
         # Get the start position for debugging
         start_pos = self.position
 
-        # Skip empty lines
-        self.consume_whitespace()
-        if self.position >= self.length:
-            return None
-
         # Skip if we're looking at a number (probably part of a choices block)
-        if self.content[self.position].isdigit():
+        if kind == TOKEN_NUMBER:
             self.skip_to_next_line()
             return None
 
-        name = self.parse_identifier()
-        if not name:  # Skip empty lines
+        if kind != TOKEN_IDENT:  # Skip empty lines
             return None
 
-        self.consume_whitespace()
+        # Interned, as attribute names repeat across entities and become keys
+        name = sys.intern(value.decode("ascii"))
+        self.position = end
 
         # Check for choices block
-        if name == "choices":
-            if self.content[self.position] == "=":
-                choices = self.parse_choices()
-                # Store choices in the last parsed attribute
-                if self.last_attribute is not None:
-                    self.last_attribute.choices = choices
-                return None
+        if name == "choices" and self._accept(b"="):
+            choices = self.parse_choices()
+            # Store choices in the last parsed attribute
+            if self.last_attribute is not None:
+                self.last_attribute["choices"] = choices
+            return None
 
         # Parse type in parentheses
         attr_type = self.parse_parentheses()
         if not attr_type:
-            # Only print warning if this isn't part of a choices block
-            if not name[0].isdigit():
-                print(
-                    f"Warning: Failed to parse type for attribute near: {self.content[start_pos : start_pos + 50]}..."
-                )
+            print(
+                f"Warning: Failed to parse type for attribute near: {_decode(self.content[start_pos : start_pos + 50])}..."
+            )
             return None
 
-        self.consume_whitespace()
         description = ""
         default = None
 
         # Parse description and default value
-        if self.position < self.length and self.content[self.position] == ":":
-            self.position += 1
-            self.consume_whitespace()
+        if self._accept(b":"):
             description = self.parse_string()
 
-            self.consume_whitespace()
-            if self.position < self.length and self.content[self.position] == ":":
-                self.position += 1
-                self.consume_whitespace()
-                if self.content[self.position] == '"':
-                    default = self.parse_string()
-                elif (
-                    self.content[self.position].isdigit()
-                    or self.content[self.position] == "-"
-                ):
-                    default = self.parse_number()
-
-        attr = Attribute(
-            name=name,
-            type=attr_type,
-            description=description,
-            default=default,
-            choices=None,
-        )
+            if self._accept(b":"):
+                kind, value, end = self._next_token()
+                if kind == TOKEN_STRING:
+                    default = _decode(value[1:-1].strip())
+                    self.position = end
+                elif kind == TOKEN_NUMBER:
+                    default = value.decode("ascii")
+                    self.position = end
+
+        attr: Attribute = {
+            "name": name,
+            "type": attr_type,
+            "type_code": _classify_type(attr_type),
+            "description": description,
+            "default": default,
+            "choices": None,
+        }
         self.last_attribute = attr  # Store reference to last parsed attribute
         return attr
 
-    def parse_number(self) -> str:
-        start = self.position
-        while self.position < self.length and (
-            self.content[self.position].isdigit() or self.content[self.position] in ".-"
-        ):
-            self.position += 1
-        return self.content[start : self.position]
-
     def parse_identifier(self) -> str:
         """Parse an identifier which may include dots (e.g., 'damage_zone.head')"""
-        self.consume_whitespace()
-        start = self.position
-
-        # Allow alphanumeric, underscore, and dot in identifiers
-        while self.position < self.length and (
-            self.content[self.position].isalnum()
-            or self.content[self.position] in ["_", "."]
-        ):
-            self.position += 1
+        kind, value, end = self._next_token()
+        if kind != TOKEN_IDENT:
+            return ""
 
-        return self.content[start : self.position]
+        self.position = end
+        return value.decode("ascii")
 
     def parse_parentheses(self) -> Optional[str]:
-        self.consume_whitespace()
-        if self.position >= self.length or self.content[self.position] != "(":
+        if not self._accept(b"("):
             return None
 
-        self.position += 1  # Skip (
         start = self.position
 
-        # Find closing parenthesis, but don't get stuck
-        max_iterations = 1000  # Safety limit
-        iterations = 0
-        parentheses_count = 1
-
-        while (
-            self.position < self.length
-            and parentheses_count > 0
-            and iterations < max_iterations
-        ):
-            char = self.content[self.position]
-            if char == "(":
-                parentheses_count += 1
-            elif char == ")":
-                parentheses_count -= 1
-            self.position += 1
-            iterations += 1
+        # Jump from one ")" to the next, counting any "(" skipped on the way.
+        # Un-nested groups, the common case, are resolved by the first find.
+        depth = 1
+        while depth:
+            close = self.content.find(b")", self.position)
+            if close == -1:
+                self.position = self.length
+                print(
+                    f"Warning: Possible parsing error near: {_decode(self.content[start : start + 50])}..."
+                )
+                return None
 
-        if parentheses_count > 0 or iterations >= max_iterations:
-            print(
-                f"Warning: Possible parsing error near: {self.content[start : start + 50]}..."
-            )
-            return None
+            depth += self.content.count(b"(", self.position, close) - 1
+            self.position = close + 1
 
-        return self.content[start : self.position - 1].strip()
+        return _decode(self.content[start : self.position - 1].strip())
 
     def parse_string(self) -> str:
-        self.consume_whitespace()
-        if self.position >= self.length or self.content[self.position] != '"':
+        kind, value, end = self._next_token()
+        if kind != TOKEN_STRING:
             return ""
 
-        self.position += 1  # Skip opening quote
-        start = self.position
-
-        # Add safety limit here too
-        max_iterations = 1000
-        iterations = 0
-
-        while (
-            self.position < self.length
-            and self.content[self.position] != '"'
-            and iterations < max_iterations
-        ):
-            self.position += 1
-            iterations += 1
+        self.position = end
+        return _decode(value[1:-1].strip())
 
-        if iterations >= max_iterations:
-            print(
-                f"Warning: Possible parsing error in string near: {self.content[start : start + 50]}..."
-            )
-            return ""
-
-        result = self.content[start : self.position].strip()
-        self.position += 1  # Skip closing quote
-        return result
+    def parse_model(self) -> Optional[Dict[str, Any]]:
+        """Parse a model parameter into a dict, wrapping plain paths as {"path": ...}"""
+        model_str = self.parse_model_parameter()
+        try:
+            # Handle JSON-like model parameter
+            return json.loads(model_str.replace("'", '"'))
+        except json.JSONDecodeError:
+            return {"path": model_str}
+        except Exception as e:
+            print(f"Warning: Failed to parse model parameter: {e}")
+            return {"path": model_str}
 
     def parse_model_parameter(self) -> str:
         """Parse a model parameter which may be a simple path or JSON-like object"""
-        self.consume_whitespace()
-        if self.position >= self.length:
-            return ""
-
-        if self.content[self.position] != "(":
+        if not self._accept(b"("):
             return ""
 
-        self.position += 1  # Skip (
         start = self.position
 
         # Handle nested braces for JSON-like syntax
@@ -356,115 +500,183 @@ class FGDParser:
         while self.position < self.length:
             char = self.content[self.position]
 
-            if char == "{":
+            if char == _LBRACE:
                 brace_count += 1
-            elif char == "}":
+            elif char == _RBRACE:
                 brace_count -= 1
-            elif char == "(" and brace_count == 0:
+            elif char == _LPAREN and brace_count == 0:
                 paren_count += 1
-            elif char == ")" and brace_count == 0:
+            elif char == _RPAREN and brace_count == 0:
                 paren_count -= 1
                 if paren_count == 0:
                     break
 
             self.position += 1
 
-        result = self.content[start : self.position].strip()
+        result = _decode(self.content[start : self.position].strip())
         self.position += 1  # Skip closing parenthesis
         return result
 
     def skip_to_next_line(self):
         """Skip to the start of the next line"""
-        while self.position < self.length and self.content[self.position] != "\n":
-            self.position += 1
-        self.position += 1  # Skip the newline
+        newline = self.content.find(b"\n", self.position)
+        self.position = self.length if newline == -1 else newline + 1
 
     def parse_choices(self) -> List[Choice]:
-        """Parse a choices block into a list of Choice objects"""
+        """Parse a choices block into a list of Choice dicts"""
         choices = []
 
-        # Skip the equals sign and find opening bracket
-        self.position += 1
-        self.consume_whitespace()
-
-        if self.content[self.position] != "[":
+        # Find opening bracket
+        if not self._accept(b"["):
             return choices
 
-        self.position += 1  # Skip [
-
-        while self.position < self.length:
-            self.consume_whitespace()
+        while True:
+            kind, value, end = self._next_token()
+            if kind is None:
+                break
 
             # Check for end of choices
-            if self.content[self.position] == "]":
-                self.position += 1
+            if kind == TOKEN_PUNCT and value == b"]":
+                self.position = end
                 break
 
-            # Skip comments
-            if self.content[self.position :].startswith("//"):
-                self.skip_line()
-                continue
-
             # Parse choice value (number)
-            value = ""
-            while self.position < self.length and (
-                self.content[self.position].isdigit()
-                or self.content[self.position] == "-"
-            ):
-                value += self.content[self.position]
-                self.position += 1
-
-            if not value:  # Skip if no value found
+            if kind != TOKEN_NUMBER:  # Skip if no value found
                 self.skip_to_next_line()
                 continue
 
-            self.consume_whitespace()
+            self.position = end
 
-            # Skip colon
-            if self.content[self.position] == ":":
-                self.position += 1
-                self.consume_whitespace()
-
-                # Parse description
-                if self.content[self.position] == '"':
-                    description = self.parse_string()
-                    choices.append(Choice(value=value.strip(), description=description))
-                else:
-                    self.skip_to_next_line()
+            # Skip colon and parse description
+            if self._accept(b":") and self._next_token()[0] == TOKEN_STRING:
+                description = self.parse_string()
+                choices.append(
+                    {"value": value.decode("ascii"), "description": description}
+                )
             else:
                 self.skip_to_next_line()
 
         return choices
 
 
-def parse_fgd_file(filename: str) -> List[dict]:
-    with open(filename, "r") as f:
+# Entity header keywords (the "key(...)" pairs before "=") and their parsers
+_HEADER_HANDLERS = {
+    "base": FGDParser.parse_parentheses,
+    "color": FGDParser.parse_parentheses,
+    "size": FGDParser.parse_parentheses,
+    "model": FGDParser.parse_model,
+}
+
+
+# Parsed FGD files keyed by (path, mtime, size), least recently used first
+_FGD_CACHE: "OrderedDict[Tuple[str, int, int], List[EntityClass]]" = OrderedDict()
+_FGD_CACHE_SIZE = 8
+_FGD_CACHE_LOCK = threading.Lock()
+
+
+def parse_fgd_file(filename: str) -> List[EntityClass]:
+    stat = os.stat(filename)
+    key = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+    with _FGD_CACHE_LOCK:
+        if key in _FGD_CACHE:
+            _FGD_CACHE.move_to_end(key)
+            return _FGD_CACHE[key]
+
+    with open(filename, "rb") as f:
         content = f.read()
 
     parser = FGDParser(content)
     entities = parser.parse()
 
-    # Convert to dictionary format
-    return [asdict(entity) for entity in entities]
+    with _FGD_CACHE_LOCK:
+        _FGD_CACHE[key] = entities
+        if len(_FGD_CACHE) > _FGD_CACHE_SIZE:
+            _FGD_CACHE.popitem(last=False)
+    return entities
+
+
+def parse_fgd_files(filenames: List[str]) -> List[List[EntityClass]]:
+    """Parse several FGD files on a thread pool, results in input order. File
+    reads and the JIT tokenizer release the GIL, the rest of the parse doesn't"""
+    if len(filenames) == 1:
+        return [parse_fgd_file(filenames[0])]
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(parse_fgd_file, filenames))
 
 
 # Global variable to store parsed entities
 ENTITY_CLASSES = []
 
+# The same entities indexed by classname, rebuilt whenever ENTITY_CLASSES is
+ENTITY_BY_CLASSNAME = {}
+
+
+class FGDStore:
+    """Flat, struct-of-arrays copy of the visible (non "_") entity attributes.
+
+    Used by the panel draw and property update callbacks. The attributes of
+    entity i are the indices entity_attr_start[i] to entity_attr_end[i] of the
+    attr_* lists.
+    """
+
+    def __init__(self, entities: List[EntityClass]):
+        self.entity_index: Dict[str, int] = {}
+        self.entity_attr_start = array("I")
+        self.entity_attr_end = array("I")
+        self.attr_name: List[str] = []
+        self.attr_prop_name: List[str] = []
+        self.attr_label: List[str] = []
+
+        for index, entity in enumerate(entities):
+            self.entity_index[entity["classname"]] = index
+            self.entity_attr_start.append(len(self.attr_name))
+            for attr in entity["attributes"]:
+                if attr["name"].startswith("_"):
+                    continue
+
+                self.attr_name.append(attr["name"])
+                self.attr_prop_name.append(attr["_prop_key"])
+                self.attr_label.append(attr["name"] or attr["description"])
+            self.entity_attr_end.append(len(self.attr_name))
+
+    def attribute_range(self, classname: str) -> range:
+        """Indices into the attr_* lists for an entity, empty if it is unknown"""
+        index = self.entity_index.get(classname)
+        if index is None:
+            return range(0)
+        return range(self.entity_attr_start[index], self.entity_attr_end[index])
+
+
+# Store for the loaded entities, rebuilt whenever ENTITY_CLASSES is
+ENTITY_STORE = FGDStore([])
+
+# Panel state derived from the last FGD load, so draw() doesn't recompute it
+_FGD_BUTTON_TEXT = "Load FGD File"
+_ENTITIES_LOADED = False
+
 
 def update_entity_type(self, context):
+    # Blender also fires this when the enum is set to its current value, e.g.
+    # on duplication. Attribute updates go straight to update_entity_properties,
+    # so only the type change is short-circuited here.
+    if self.get("_applied_classname") == self.entity_classname:
+        return
     update_entity_properties(self, context)
 
 
 def update_entity_properties(self, context):
-    obj = context.active_object
+    obj = self.id_data
     if not obj:
         return
 
-    # Clear existing entity-related custom properties
-    for prop in list(obj.keys()):
-        if prop != "entity_props":
-            del obj[prop]
+    # Clear the custom properties written by the previous update. The list is
+    # kept on the property group, since everything on obj itself is exported
+    # as an entity key.
+    for key in self.get("_written_keys", ()):
+        obj.pop(key, None)
+    self["_written_keys"] = []
+    self["_applied_classname"] = self.entity_classname
 
     # If no entity type is selected, we're done
     if self.entity_classname == "none":
@@ -472,37 +684,42 @@ def update_entity_properties(self, context):
 
     # Set the classname
     obj["classname"] = self.entity_classname
+    written_keys = ["classname"]
 
-    # Find the entity class definition
-    entity_class = next(
-        (e for e in ENTITY_CLASSES if e["classname"] == self.entity_classname), None
-    )
-    if not entity_class:
-        return
+    # Update custom properties for each attribute of the entity class
+    store = ENTITY_STORE
+    for index in store.attribute_range(self.entity_classname):
+        value = getattr(self, store.attr_prop_name[index])
+        if value is not None and value != "":
+            attr_name = store.attr_name[index]
+            obj[attr_name] = value
+            written_keys.append(attr_name)
+
+    self["_written_keys"] = written_keys
+
+
+# Items of the entity_classname enum, replaced when an FGD is loaded. Blender
+# needs the strings returned by an items callback to stay referenced.
+_ENTITY_ITEMS = [("none", "None", "No entity type selected")]
 
-    # Update custom properties for each attribute
-    for attr in entity_class["attributes"]:
-        if attr["name"].startswith("_"):
-            continue
 
-        prop_name = f"prop_{attr['name']}"
-        if hasattr(self, prop_name):
-            value = getattr(self, prop_name)
-            if value is not None and value != "":
-                obj[f"{attr['name']}"] = value
+def _entity_items(self, context):
+    return _ENTITY_ITEMS
 
 
 class EntityPropertyGroup(PropertyGroup):
     entity_classname: EnumProperty(
         name="Entity Type",
         description="Select the entity type",
-        items=[("none", "None", "No entity type selected")],
-        default="none",
+        items=_entity_items,
+        default=0,  # "none", dynamic enums only take an index as default
         update=update_entity_type,
     )
 
     last_fgd_path: StringProperty(
-        name="Last FGD Path", description="Path to the last loaded FGD file", default=""
+        name="Last FGD Paths",
+        description="Paths to the last loaded FGD files, separated by os.pathsep",
+        default="",
     )
 
     # Dynamic properties will be added here
@@ -521,12 +738,7 @@ class OBJECT_PT_entity_properties(Panel):
 
         # Add Load FGD button at the top of the panel
         row = layout.row()
-        last_fgd = context.scene.entity_props.last_fgd_path
-        if last_fgd and ENTITY_CLASSES:  # Only show filename if we have entities loaded
-            button_text = f"FGD: {os.path.basename(last_fgd)}"
-        else:
-            button_text = "Load FGD File"
-        row.operator("object.load_fgd", text=button_text, icon="IMPORT")
+        row.operator("object.load_fgd", text=_FGD_BUTTON_TEXT, icon="IMPORT")
 
         if not obj:
             layout.label(text="No object selected")
@@ -539,10 +751,7 @@ class OBJECT_PT_entity_properties(Panel):
 
         # Draw dynamic properties if an entity is selected
         if props.entity_classname != "none":
-            entity_class = next(
-                (e for e in ENTITY_CLASSES if e["classname"] == props.entity_classname),
-                None,
-            )
+            entity_class = ENTITY_BY_CLASSNAME.get(props.entity_classname)
             if entity_class:
                 # Add description before the box
                 if entity_class["description"]:
@@ -551,16 +760,11 @@ class OBJECT_PT_entity_properties(Panel):
                 box = layout.box()
                 box.label(text=f"Properties for {entity_class['classname']}")
 
-                for attr in entity_class["attributes"]:
-                    # Skip internal properties
-                    if attr["name"].startswith("_"):
-                        continue
-
-                    prop_name = f"prop_{attr['name']}"
-                    if hasattr(props, prop_name):
-                        box.prop(
-                            props, prop_name, text=attr["name"] or attr["description"]
-                        )
+                store = ENTITY_STORE
+                for index in store.attribute_range(entity_class["classname"]):
+                    box.prop(
+                        props, store.attr_prop_name[index], text=store.attr_label[index]
+                    )
 
 
 class OBJECT_PT_entity_toolbar(Panel):
@@ -575,21 +779,25 @@ class OBJECT_PT_entity_toolbar(Panel):
 
         # Add Load FGD button at the top
         row = layout.row()
-        last_fgd = context.scene.entity_props.last_fgd_path
-        if last_fgd and ENTITY_CLASSES:
-            button_text = f"FGD: {os.path.basename(last_fgd)}"
-        else:
-            button_text = "Load FGD File"
-        row.operator("object.load_fgd", text=button_text, icon="IMPORT")
+        row.operator("object.load_fgd", text=_FGD_BUTTON_TEXT, icon="IMPORT")
 
         # Add Bootstrap Level button (disabled if no FGD loaded)
         row = layout.row()
         row.operator("object.bootstrap_level", icon="SCENE_DATA")
-        row.enabled = bool(ENTITY_CLASSES)  # Disable if no entities are loaded
-        if not ENTITY_CLASSES:
+        row.enabled = _ENTITIES_LOADED  # Disable if no entities are loaded
+        if not _ENTITIES_LOADED:
             row.operator("object.load_fgd", text="Load FGD to enable", icon="ERROR")
 
 
+# Blender property, default converter and fallback default for each TYPE_*
+_PROPERTY_TYPES = {
+    TYPE_STRING: (StringProperty, str, ""),
+    TYPE_INTEGER: (IntProperty, int, 0),
+    TYPE_FLOAT: (FloatProperty, float, 0.0),
+    TYPE_BOOLEAN: (BoolProperty, bool, False),
+}
+
+
 class OBJECT_OT_load_fgd(Operator):
     bl_idname = "object.load_fgd"
     bl_label = "Load FGD File"
@@ -599,39 +807,87 @@ class OBJECT_OT_load_fgd(Operator):
         subtype="FILE_PATH",
     )
 
+    # Set by the file browser when several files are selected at once
+    files: CollectionProperty(
+        type=OperatorFileListElement,
+        options={"HIDDEN", "SKIP_SAVE"},
+    )
+
+    directory: StringProperty(
+        subtype="DIR_PATH",
+        options={"HIDDEN", "SKIP_SAVE"},
+    )
+
     def execute(self, context):
-        global ENTITY_CLASSES
+        global ENTITY_CLASSES, ENTITY_BY_CLASSNAME, ENTITY_STORE
         try:
-            ENTITY_CLASSES = parse_fgd_file(self.filepath)
+            filepaths = [
+                os.path.join(self.directory, f.name) for f in self.files if f.name
+            ] or [self.filepath]
+            results = parse_fgd_files(filepaths)
+            if len(results) == 1:
+                ENTITY_CLASSES = results[0]
+            else:
+                # Later files (e.g. a mod on top of its base game) override
+                # classes of the same name from earlier ones
+                merged = {}
+                for entities in results:
+                    for entity in entities:
+                        merged[entity["classname"]] = entity
+                ENTITY_CLASSES = list(merged.values())
+            ENTITY_BY_CLASSNAME = {
+                entity["classname"]: entity for entity in ENTITY_CLASSES
+            }
             if not ENTITY_CLASSES:  # If no entities were loaded
                 self.report({"ERROR"}, "No entities found in FGD file")
-                context.scene.entity_props.last_fgd_path = ""  # Clear the path
+                self.set_last_fgd(context, "")  # Clear the path
                 return {"CANCELLED"}
 
             # Store the filepath only if we successfully loaded entities
-            context.scene.entity_props.last_fgd_path = self.filepath
+            self.set_last_fgd(context, os.pathsep.join(filepaths))
             self.update_entity_enum()
             self.create_dynamic_properties()
+            ENTITY_STORE = FGDStore(ENTITY_CLASSES)
+            reregister_property_group()
             return {"FINISHED"}
-        except FileNotFoundError:
-            self.report({"ERROR"}, f"FGD file not found: {self.filepath}")
-            context.scene.entity_props.last_fgd_path = ""  # Clear the path on error
+        except FileNotFoundError as e:
+            self.report({"ERROR"}, f"FGD file not found: {e.filename}")
+            self.set_last_fgd(context, "")  # Clear the path on error
             return {"CANCELLED"}
-        except PermissionError:
-            self.report({"ERROR"}, f"Permission denied accessing FGD file: {self.filepath}")
-            context.scene.entity_props.last_fgd_path = ""
+        except PermissionError as e:
+            self.report(
+                {"ERROR"}, f"Permission denied accessing FGD file: {e.filename}"
+            )
+            self.set_last_fgd(context, "")
             return {"CANCELLED"}
         except Exception as e:
             self.report({"ERROR"}, f"Failed to load FGD file: {str(e)}")
-            context.scene.entity_props.last_fgd_path = ""  # Clear the path on error
+            self.set_last_fgd(context, "")  # Clear the path on error
             return {"CANCELLED"}
 
     def invoke(self, context, event):
         context.window_manager.fileselect_add(self)
         return {"RUNNING_MODAL"}
 
+    def set_last_fgd(self, context, filepath):
+        """Store the last FGD path and refresh the panel state derived from it"""
+        global _FGD_BUTTON_TEXT, _ENTITIES_LOADED
+        context.scene.entity_props.last_fgd_path = filepath
+        _ENTITIES_LOADED = bool(ENTITY_CLASSES)
+
+        # Only show the filenames if we have entities loaded
+        if filepath and _ENTITIES_LOADED:
+            names = ", ".join(
+                os.path.basename(path) for path in filepath.split(os.pathsep)
+            )
+            _FGD_BUTTON_TEXT = f"FGD: {names}"
+        else:
+            _FGD_BUTTON_TEXT = "Load FGD File"
+
     def update_entity_enum(self):
-        # Update the enum property with loaded entities
+        # Update the enum items with loaded entities, which _entity_items()
+        # hands to Blender without re-registering the property
+        global _ENTITY_ITEMS
         items = [("none", "None", "No entity type selected")]
         items.extend(
             [
@@ -643,35 +899,36 @@ class OBJECT_OT_load_fgd(Operator):
                 for entity in ENTITY_CLASSES
             ]
         )
-
-        EntityPropertyGroup.entity_classname = EnumProperty(
-            name="Entity Type",
-            description="Select the entity type",
-            items=items,
-            default="none",
-            update=update_entity_type,
-        )
+        _ENTITY_ITEMS = items
 
     def create_dynamic_properties(self):
+        annotations = EntityPropertyGroup.__annotations__
+
         # Remove existing dynamic properties
-        for key in list(EntityPropertyGroup.__annotations__.keys()):
-            if key.startswith("prop_"):
-                delattr(EntityPropertyGroup, key)
+        for key in [key for key in annotations if key.startswith("prop_")]:
+            del annotations[key]
 
-        # Create new properties for each attribute in all entities
+        # Attributes shared by several entities only need one property. The
+        # property name is kept on the attribute as _prop_key for FGDStore.
+        unique = {}
         for entity in ENTITY_CLASSES:
             for attr in entity["attributes"]:
                 if attr["name"].startswith("_"):
                     continue
 
-                prop_name = f"prop_{attr['name']}"
-                if prop_name not in EntityPropertyGroup.__annotations__:
-                    prop = self.create_property_from_attribute(attr)
-                    setattr(EntityPropertyGroup, prop_name, prop)
+                prop_key = attr["_prop_key"] = sys.intern(f"prop_{attr['name']}")
+                unique.setdefault(prop_key, attr)
 
-    def create_property_from_attribute(self, attr):
-        attr_type = attr["type"].lower()
+        # Only the annotations are touched here, reregister_property_group()
+        # applies them all at once
+        annotations.update(
+            {
+                prop_name: self.create_property_from_attribute(attr)
+                for prop_name, attr in unique.items()
+            }
+        )
 
+    def create_property_from_attribute(self, attr):
         if attr["choices"]:
             # Create enum property for choices
             items = [
@@ -684,39 +941,146 @@ class OBJECT_OT_load_fgd(Operator):
                 default=attr["default"] if attr["default"] else items[0][0],
             )
 
-        if "integer" in attr_type:
-            return IntProperty(
-                name=attr["name"],
-                description=attr["description"] or "",
-                default=int(attr["default"]) if attr["default"] else 0,
-                update=update_entity_properties,
-            )
-
-        if "float" in attr_type or "decimal" in attr_type:
-            return FloatProperty(
-                name=attr["name"],
-                description=attr["description"] or "",
-                default=float(attr["default"]) if attr["default"] else 0.0,
-                update=update_entity_properties,
-            )
-
-        if "boolean" in attr_type:
-            return BoolProperty(
-                name=attr["name"],
-                description=attr["description"] or "",
-                default=bool(attr["default"]) if attr["default"] else False,
-                update=update_entity_properties,
-            )
-
-        # Default to string property
-        return StringProperty(
+        prop_type, convert, fallback = _PROPERTY_TYPES[attr["type_code"]]
+        return prop_type(
             name=attr["name"],
             description=attr["description"] or "",
-            default=attr["default"] if attr["default"] else "",
+            default=convert(attr["default"]) if attr["default"] else fallback,
             update=update_entity_properties,
         )
 
 
+def get_or_create_material(name):
+    """Return the material with the given name, creating it if needed"""
+    return bpy.data.materials.get(name) or bpy.data.materials.new(name=name)
+
+
+# Blender's available collection color tags (COLOR_01 = red, COLOR_02 = orange,
+# etc) as (tag, r, g, b)
+_COLOR_TAGS = (
+    ("NONE", 0.0, 0.0, 0.0),
+    ("COLOR_01", 1.0, 0.0, 0.0),  # Red
+    ("COLOR_02", 1.0, 0.5, 0.0),  # Orange
+    ("COLOR_03", 1.0, 1.0, 0.0),  # Yellow
+    ("COLOR_04", 0.0, 1.0, 0.0),  # Green
+    ("COLOR_05", 0.0, 0.0, 1.0),  # Blue
+    ("COLOR_06", 0.7, 0.0, 1.0),  # Violet
+    ("COLOR_07", 1.0, 0.5, 1.0),  # Pink
+    ("COLOR_08", 0.5, 0.5, 0.5),  # Gray
+)
+_TAG_NAMES = tuple(tag for tag, r, g, b in _COLOR_TAGS)
+_TAG_BY_RGB = {(r, g, b): tag for tag, r, g, b in _COLOR_TAGS}
+
+# Colors are matched by distance in RGB scaled per channel, which weighs the
+# squared differences 2:4:3 so green and blue shifts count more than red
+_COLOR_SCALE = np.sqrt(np.array((2.0, 4.0, 3.0), dtype=np.float32))
+
+# The scaled palette, one contiguous float32 array per channel
+_PALETTE_R, _PALETTE_G, _PALETTE_B = (
+    np.array([tag[channel + 1] for tag in _COLOR_TAGS], dtype=np.float32)
+    * _COLOR_SCALE[channel]
+    for channel in range(3)
+)
+
+# Index into _TAG_NAMES for every cell of an N*N*N RGB grid, built on first use
+_COLOR_LUT_SIZE = 32
+_COLOR_LUT: Optional[bytearray] = None
+
+
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def _nearest(palette_r, palette_g, palette_b, r, g, b):
+        """Index of the palette entry closest to (r, g, b)"""
+        best_i = 0
+        best_d = np.inf
+        for i in range(palette_r.shape[0]):
+            dr = palette_r[i] - r
+            dg = palette_g[i] - g
+            db = palette_b[i] - b
+            d = dr * dr + dg * dg + db * db
+            if d < best_d:
+                best_i = i
+                best_d = d
+        return best_i
+
+    @numba.njit(cache=True)
+    def _fill_color_lut(lut, axis, palette_r, palette_g, palette_b, scale):
+        n = axis.shape[0]
+        for i in range(n):
+            r = axis[i] * scale[0]
+            for j in range(n):
+                g = axis[j] * scale[1]
+                for k in range(n):
+                    lut[(i * n + j) * n + k] = _nearest(
+                        palette_r, palette_g, palette_b, r, g, axis[k] * scale[2]
+                    )
+
+
+def _build_color_lut() -> bytearray:
+    n = _COLOR_LUT_SIZE
+    axis = np.linspace(0.0, 1.0, n, dtype=np.float32)
+    if numba is not None:
+        lut = np.empty(n * n * n, np.uint8)
+        _fill_color_lut(lut, axis, _PALETTE_R, _PALETTE_G, _PALETTE_B, _COLOR_SCALE)
+        return bytearray(lut.tobytes())
+
+    # Distances of shape (n, n, n, tags), broadcast one channel per axis
+    r = (axis * _COLOR_SCALE[0])[:, None, None, None]
+    g = (axis * _COLOR_SCALE[1])[None, :, None, None]
+    b = (axis * _COLOR_SCALE[2])[None, None, :, None]
+    distances = (_PALETTE_R - r) ** 2 + (_PALETTE_G - g) ** 2 + (_PALETTE_B - b) ** 2
+    return bytearray(np.argmin(distances, axis=3).astype(np.uint8).tobytes())
+
+
+@functools.lru_cache(maxsize=256)
+def _cell_color_tag(cell: Tuple[int, int, int]) -> str:
+    """Closest collection color tag for a cell of the _COLOR_LUT grid"""
+    global _COLOR_LUT
+    if _COLOR_LUT is None:
+        _COLOR_LUT = _build_color_lut()
+    n = _COLOR_LUT_SIZE
+    r, g, b = cell
+    return _TAG_NAMES[_COLOR_LUT[(r * n + g) * n + b]]
+
+
+def closest_color_tag(color) -> str:
+    """Convert RGB color to closest available collection color tag"""
+    # Palette colors are their own tag, no need to quantize them
+    tag = _TAG_BY_RGB.get(tuple(color[:3]))
+    if tag is not None:
+        return tag
+
+    # Look up the closest color of the nearest grid cell
+    top = _COLOR_LUT_SIZE - 1
+    return _cell_color_tag(
+        (
+            min(max(int(color[0] * top + 0.5), 0), top),
+            min(max(int(color[1] * top + 0.5), 0), top),
+            min(max(int(color[2] * top + 0.5), 0), top),
+        )
+    )
+
+
+# closest_color_tag() results for the collection colors used by
+# bootstrap_level, and None for collections without a color
+_COLOR_TAG_BY_TUPLE = {
+    None: "NONE",
+    (1.0, 1.0, 0.0, 1.0): "COLOR_03",  # Yellow
+    (0.0, 0.5, 1.0, 1.0): "COLOR_05",  # Blue
+    (1.0, 0.5, 0.0, 1.0): "COLOR_02",  # Orange
+    (0.7, 0.0, 1.0, 1.0): "COLOR_06",  # Purple
+    (0.0, 1.0, 0.0, 1.0): "COLOR_04",  # Green
+}
+
+
+def new_bmesh():
+    """Return an empty bmesh with a UV map, so primitives get UVs as with bpy.ops"""
+    bm = bmesh.new()
+    bm.loops.layers.uv.new("UVMap")
+    return bm
+
+
 class OBJECT_OT_bootstrap_level(Operator):
     bl_idname = "object.bootstrap_level"
     bl_label = "Bootstrap Level"
@@ -726,13 +1090,18 @@ class OBJECT_OT_bootstrap_level(Operator):
     # Heavily inspired by D-Meat's Blender mapping standards
     # https://modwiki.dhewm3.org/RBDoom3BFG-Blender-Mapping
     def execute(self, context):
-        # Delete all objects and collections
-        bpy.ops.object.select_all(action="SELECT")
-        bpy.ops.object.delete()
+        # Delete all objects and collections. Removing the datablocks directly
+        # skips the selection and delete operators and their undo pushes.
+        for obj in list(context.scene.objects):
+            bpy.data.objects.remove(obj, do_unlink=True)
 
-        for collection in bpy.data.collections:
+        for collection in list(bpy.data.collections):
             bpy.data.collections.remove(collection)
 
+        # Collections resolved by move_to_collection() during this run, keyed
+        # by collection path
+        self._collections = {}
+
         # Create main collections with colors
         collections = {
             "Lights": (1.0, 1.0, 0.0, 1.0),  # Yellow
@@ -754,181 +1123,161 @@ class OBJECT_OT_bootstrap_level(Operator):
         for name, color in collections.items():
             coll = bpy.data.collections.new(name)
             bpy.context.scene.collection.children.link(coll)
-            if color:
-                coll.color_tag = self.closest_color_tag(color)
+            coll.color_tag = self.color_tag(color)
 
         # Create Point Entities subcollections
         point_entities_coll = bpy.data.collections["Point Entities"]
         for name, color in point_entity_subs.items():
             sub_coll = bpy.data.collections.new(name)
             point_entities_coll.children.link(sub_coll)
-            if color:
-                sub_coll.color_tag = self.closest_color_tag(color)
+            sub_coll.color_tag = self.color_tag(color)
 
         # Set scene units to None
         context.scene.unit_settings.system = "NONE"
 
         # Setup grid
-        for area in context.screen.areas:
-            if area.type == "VIEW_3D":
-                for space in area.spaces:
-                    if space.type == "VIEW_3D":
-                        space.clip_start = 1
-                        space.clip_end = 25000
-                        # Set grid settings
-                        space.overlay.grid_scale = 1  # 1 unit grid
-                        space.overlay.grid_subdivisions = 10  # 10 subdivisions
-                        space.overlay.grid_lines = 100  # Show 100x100 grid lines
-                        # Ensure grid is visible
-                        space.overlay.show_floor = True
-                        space.overlay.show_axis_x = True
-                        space.overlay.show_axis_y = True
-                        space.overlay.show_ortho_grid = True
-
-        # Create worldspawn environment cube
-        bpy.ops.mesh.primitive_cube_add(size=1024, location=(0, 0, 0))
-        env_cube = context.active_object
-        env_cube.name = "worldspawn.env"
-
-        # Move to Worldspawn collection
-        self.move_to_collection(env_cube, "Worldspawn")
-
-        # Flip normals
-        bpy.ops.object.mode_set(mode="EDIT")
-        bpy.ops.mesh.select_all(action="SELECT")
-        bpy.ops.mesh.flip_normals()
-        bpy.ops.object.mode_set(mode="OBJECT")
+        view3d_spaces = [
+            space
+            for area in context.screen.areas
+            if area.type == "VIEW_3D"
+            for space in area.spaces
+            if space.type == "VIEW_3D"
+        ]
+        for space in view3d_spaces:
+            space.clip_start = 1
+            space.clip_end = 25000
+            # Set grid settings
+            overlay = space.overlay
+            overlay.grid_scale = 1  # 1 unit grid
+            overlay.grid_subdivisions = 10  # 10 subdivisions
+            overlay.grid_lines = 100  # Show 100x100 grid lines
+            # Ensure grid is visible
+            overlay.show_floor = True
+            overlay.show_axis_x = True
+            overlay.show_axis_y = True
+            overlay.show_ortho_grid = True
+
+        # Objects are built through bpy.data and bmesh rather than bpy.ops, which
+        # would run the operator machinery and a scene update for every step
+
+        # Create worldspawn environment cube, flipping its normals to face inwards
+        bm = new_bmesh()
+        bmesh.ops.create_cube(bm, size=1024, calc_uvs=True)
+        bmesh.ops.reverse_faces(bm, faces=bm.faces)
+        env_cube = self.add_mesh_object("worldspawn.env", bm, "Worldspawn")
 
         # Set material (assuming material exists)
-        mat_name = "textures/skies/sunset_in_the_chalk_quarry"
-        if mat_name not in bpy.data.materials:
-            mat = bpy.data.materials.new(name=mat_name)
-        else:
-            mat = bpy.data.materials[mat_name]
-        env_cube.data.materials.append(mat)
-
-        # Create floor plane
-        bpy.ops.mesh.primitive_plane_add(size=1000, location=(0, 0, 0))
-        floor = context.active_object
-        floor.name = "BSP.brush"
+        env_cube.data.materials.append(
+            get_or_create_material("textures/skies/sunset_in_the_chalk_quarry")
+        )
 
-        # Move to Worldspawn collection
-        self.move_to_collection(floor, "Worldspawn")
+        # Create 1000x1000 floor plane (create_grid takes half the width)
+        bm = new_bmesh()
+        bmesh.ops.create_grid(bm, x_segments=1, y_segments=1, size=500, calc_uvs=True)
+        floor = self.add_mesh_object("BSP.brush", bm, "Worldspawn")
 
         # Set material
-        mat_name = "textures/base_wall/snpanel2rust"
-        if mat_name not in bpy.data.materials:
-            mat = bpy.data.materials.new(name=mat_name)
-        else:
-            mat = bpy.data.materials[mat_name]
-        floor.data.materials.append(mat)
+        floor.data.materials.append(
+            get_or_create_material("textures/base_wall/snpanel2rust")
+        )
 
         # Create worldspawn empty
-        bpy.ops.object.empty_add(type="PLAIN_AXES", location=(0, 0, 0))
-        worldspawn = context.active_object
-        worldspawn.name = "worldspawn"
-
-        # Move to Worldspawn collection
-        self.move_to_collection(worldspawn, "Worldspawn")
+        worldspawn = self.add_object("worldspawn", None, "Worldspawn")
+        worldspawn.empty_display_type = "PLAIN_AXES"
 
         # Set entity type to worldspawn
-        if any(e["classname"] == "worldspawn" for e in ENTITY_CLASSES):
+        if "worldspawn" in ENTITY_BY_CLASSNAME:
             worldspawn.entity_props.entity_classname = "worldspawn"
             update_entity_properties(worldspawn.entity_props, context)
 
         # Create light
-        bpy.ops.object.light_add(type="POINT", location=(0, 0, 50))
-        light = context.active_object
-        light.name = "light"
-
-        # Move to Lights collection
-        self.move_to_collection(light, "Lights")
+        light_data = bpy.data.lights.new("light", type="POINT")
+        light = self.add_object("light", light_data, "Lights")
+        light.location = (0, 0, 50)
 
         # Set entity type to light
-        if any(e["classname"] == "light" for e in ENTITY_CLASSES):
+        if "light" in ENTITY_BY_CLASSNAME:
             light.entity_props.entity_classname = "light"
             update_entity_properties(light.entity_props, context)
 
-        # Create player start
-        bpy.ops.mesh.primitive_cube_add(location=(0, 0, 32))
-        start = context.active_object
-        start.name = "info_player_start"
-        start.scale = (16, 16, 32)  # Scale to get 32x32x64 size
-        bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-
-        # Move to Player Spawns collection
-        self.move_to_collection(start, "Point Entities/Player Spawns")
-
-        # Add transparent green material
-        mat = bpy.data.materials.new(name="info_player_start_material")
-        mat.use_nodes = True
-        mat.blend_method = "BLEND"  # Enable transparency
-        nodes = mat.node_tree.nodes
-        nodes.clear()
-
-        # Create nodes for transparent green material
-        node_principled = nodes.new("ShaderNodeBsdfPrincipled")
-        node_principled.inputs["Base Color"].default_value = (0, 1, 0, 0.3)
-        node_principled.inputs["Alpha"].default_value = 0.3
-
-        node_output = nodes.new("ShaderNodeOutputMaterial")
-        mat.node_tree.links.new(
-            node_principled.outputs["BSDF"], node_output.inputs["Surface"]
+        # Create player start, scaling the 2x2x2 cube's vertices to 32x32x64
+        bm = new_bmesh()
+        bmesh.ops.create_cube(
+            bm, size=2, matrix=Matrix.Diagonal((16, 16, 32, 1)), calc_uvs=True
         )
+        start = self.add_mesh_object(
+            "info_player_start", bm, "Point Entities/Player Spawns"
+        )
+        start.location = (0, 0, 32)
+
+        # Add transparent green material, reusing the one from a previous
+        # bootstrap instead of building its node tree again
+        mat = bpy.data.materials.get("info_player_start_material")
+        if mat is None:
+            mat = bpy.data.materials.new(name="info_player_start_material")
+            mat.use_nodes = True
+            mat.blend_method = "BLEND"  # Enable transparency
+            nodes = mat.node_tree.nodes
+            nodes.clear()
+
+            # Create nodes for transparent green material
+            node_principled = nodes.new("ShaderNodeBsdfPrincipled")
+            node_principled.inputs["Base Color"].default_value = (0, 1, 0, 0.3)
+            node_principled.inputs["Alpha"].default_value = 0.3
+
+            node_output = nodes.new("ShaderNodeOutputMaterial")
+            mat.node_tree.links.new(
+                node_principled.outputs["BSDF"], node_output.inputs["Surface"]
+            )
 
-        # Assign material to player start
-        start.data.materials.clear()
+        # Assign material to player start, whose new mesh has no slots yet
         start.data.materials.append(mat)
 
         # Set entity type to info_player_start
-        if any(e["classname"] == "info_player_start" for e in ENTITY_CLASSES):
+        if "info_player_start" in ENTITY_BY_CLASSNAME:
             start.entity_props.entity_classname = "info_player_start"
             update_entity_properties(start.entity_props, context)
 
+        # Evaluate the new scene once, now that everything is in place
+        context.view_layer.update()
         return {"FINISHED"}
 
+    def add_object(self, name, data, collection_path):
+        """Create an object for data (None for an empty) in collection_path"""
+        obj = bpy.data.objects.new(name, data)
+        self.move_to_collection(obj, collection_path)
+        return obj
+
+    def add_mesh_object(self, name, bm, collection_path):
+        """Write bm to a new mesh and add an object for it, freeing bm"""
+        mesh = bpy.data.meshes.new(name)
+        bm.to_mesh(mesh)
+        bm.free()
+        return self.add_object(name, mesh, collection_path)
+
     def move_to_collection(self, obj, collection_path):
         """Move an object to a specific collection, removing it from all others"""
         # Remove from all current collections
-        for coll in obj.users_collection:
+        for coll in list(obj.users_collection):
             coll.objects.unlink(obj)
 
-        # Add to new collection
-        collection_names = collection_path.split("/")
-        target_collection = bpy.data.collections[collection_names[0]]
-
-        # Navigate through nested collections if path contains multiple levels
-        for name in collection_names[1:]:
-            target_collection = target_collection.children[name]
+        # Add to new collection, reusing the one resolved for this path
+        target_collection = self._collections.get(collection_path)
+        if target_collection is None:
+            collection_names = collection_path.split("/")
+            target_collection = bpy.data.collections[collection_names[0]]
 
-        target_collection.objects.link(obj)
+            # Navigate through nested collections if path contains multiple levels
+            for name in collection_names[1:]:
+                target_collection = target_collection.children[name]
 
-    def closest_color_tag(self, color):
-        """Convert RGB color to closest available collection color tag"""
-        # Blender's available color tags (COLOR_01 = red, COLOR_02 = orange, etc)
-        color_tags = {
-            "NONE": (0.0, 0.0, 0.0),
-            "COLOR_01": (1.0, 0.0, 0.0),  # Red
-            "COLOR_02": (1.0, 0.5, 0.0),  # Orange
-            "COLOR_03": (1.0, 1.0, 0.0),  # Yellow
-            "COLOR_04": (0.0, 1.0, 0.0),  # Green
-            "COLOR_05": (0.0, 0.0, 1.0),  # Blue
-            "COLOR_06": (0.7, 0.0, 1.0),  # Violet
-            "COLOR_07": (1.0, 0.5, 1.0),  # Pink
-            "COLOR_08": (0.5, 0.5, 0.5),  # Gray
-        }
+            self._collections[collection_path] = target_collection
 
-        # Find closest color by RGB distance
-        min_distance = float("inf")
-        closest_tag = "NONE"
-
-        for tag, tag_color in color_tags.items():
-            distance = sum((c1 - c2) ** 2 for c1, c2 in zip(color[:3], tag_color))
-            if distance < min_distance:
-                min_distance = distance
-                closest_tag = tag
+        target_collection.objects.link(obj)
 
-        return closest_tag
+    def color_tag(self, color):
+        """Collection color tag for color, which may be None for no color"""
+        return _COLOR_TAG_BY_TUPLE.get(color) or closest_color_tag(color)
 
 
 classes = (
@@ -944,28 +1293,44 @@ def menu_func(self, context):
     self.layout.operator(OBJECT_OT_load_fgd.bl_idname)
 
 
-def register():
-    for cls in classes:
-        bpy.utils.register_class(cls)
+def reregister_property_group():
+    """Re-register EntityPropertyGroup so changes to its annotations take effect"""
+    del bpy.types.Object.entity_props
+    del bpy.types.Scene.entity_props
+    bpy.utils.unregister_class(EntityPropertyGroup)
 
-    # Register the property group for both Object and Scene
+    bpy.utils.register_class(EntityPropertyGroup)
     bpy.types.Object.entity_props = PointerProperty(type=EntityPropertyGroup)
     bpy.types.Scene.entity_props = PointerProperty(type=EntityPropertyGroup)
 
+
+# Registers classes in order and unregisters them in reverse
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
+
+
+def register():
+    _register_classes()
+
+    # Register the property group for both Object and Scene
+    types = bpy.types
+    types.Object.entity_props = PointerProperty(type=EntityPropertyGroup)
+    types.Scene.entity_props = PointerProperty(type=EntityPropertyGroup)
+
     # Add the menu item
-    bpy.types.VIEW3D_MT_object.append(menu_func)
+    types.VIEW3D_MT_object.append(menu_func)
 
 
 def unregister():
+    types = bpy.types
+
     # Remove the menu item
-    bpy.types.VIEW3D_MT_object.remove(menu_func)
+    types.VIEW3D_MT_object.remove(menu_func)
 
     # Unregister the property groups
-    del bpy.types.Object.entity_props
-    del bpy.types.Scene.entity_props
+    del types.Object.entity_props
+    del types.Scene.entity_props
 
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
+    _unregister_classes()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+import pytest
+
+pytest.importorskip("bpy")
+pytest.importorskip("numba")
+
+from blender_bfg.entity_properties import FGDParser
+
+# Raw scans (parentheses, skipped lines) that stop inside a token or comment
+MISALIGNED_FGDS = [
+    b'@PointClass = a\n[\n b(str"ing) : "d)esc" : "x"\n c(integer) : "C"\n]\n',
+    b'@PointClass = a\n[\n "q\n"r(integer) : "R"\n x(integer) : "X"\n]\n',
+    b'@PointClass base(x // c)\n y) = a\n[\n k(string) : "K"\n]\n',
+]
+
+
+@pytest.mark.parametrize("content", MISALIGNED_FGDS)
+def test_jit_tokens_match_regex_tokens(content):
+    jit_parser = FGDParser(content)
+    regex_parser = FGDParser(content)
+    del regex_parser._next_token  # Back to the TOKEN_RE class method
+
+    assert jit_parser.parse() == regex_parser.parse()